@@ -52,7 +52,13 @@ import pathlib
 import re
 import zipfile
 import io
+import threading
+import functools
+import random
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -80,6 +86,10 @@ NO_DEPLOY_TYPES = {
     "MountedDataFactory",
 }
 
+# Lower-cased copy for case-insensitive lookups – folder names on disk do
+# not necessarily preserve the casing the API uses for the item type.
+NO_DEPLOY_TYPES_LC = frozenset(t.lower() for t in NO_DEPLOY_TYPES)
+
 # Map of lower-cased item type to the definition format string the API
 # requires when uploading parts.  Types not listed here omit the format
 # field, letting the API use its default.
@@ -97,9 +107,18 @@ METADATA_ONLY_TYPES = {
     "Warehouse",
 }
 
+# Item folders are named "<DisplayName>.<ItemType>".  The type is everything
+# after the LAST dot, e.g. "My.Report.Report" → name="My.Report", type="Report".
+ITEM_DIR_RE = re.compile(r"^(.+)\.([^.]+)$")
+
 # Files to exclude from the definition parts list.
 EXCLUDED_FILES = {".platform"}
 
+# Temporary files sync_powerbi.py writes before renaming them into place
+# (".<name>.tmp").  One can be left behind if a sync is killed mid-write;
+# it must never be uploaded as a definition part.
+SYNC_TEMP_FILE_RE = re.compile(r"^\..+\.tmp$")
+
 # File extensions that are ZIP archives whose raw bytes may differ between
 # exports even when the logical content is identical (embedded timestamps,
 # compression metadata, etc.).
@@ -109,9 +128,157 @@ ZIP_EXTENSIONS = {".dacpac", ".bacpac", ".nupkg"}
 # regenerated on every Fabric export.
 ZIP_VOLATILE_MEMBERS = {"DacMetadata.xml", "Origin.xml"}
 
-# Long-running operation poll settings
-POLL_INTERVAL = 5    # seconds between polls
-POLL_MAX      = 72   # 72 × 5 s = 6 min max per item
+# Long-running operation poll settings.  The delay between status checks
+# starts short (most definition operations finish within a few seconds) and
+# grows geometrically up to MAX_POLL_DELAY.  Each sleep is jittered so that
+# items submitted together do not keep polling in lock-step.
+INITIAL_POLL_DELAY = 1.0    # seconds before the first status check
+POLL_MULTIPLIER    = 1.5    # growth factor applied after every check
+MAX_POLL_DELAY     = 45.0   # upper bound on the delay between checks
+POLL_JITTER        = 0.2    # each sleep is scaled by a random 1 ± POLL_JITTER
+TOTAL_POLL_TIMEOUT = 360    # 6 min max per item
+
+# Number of items deployed concurrently.  The work is almost entirely
+# network-bound (REST calls + LRO polling), so the pool is sized well above
+# the CPU count; Fabric throttling is the practical upper bound.
+MAX_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+# Number of threads used to read and encode the files of a single item.
+FILE_IO_WORKERS = 8
+
+# 429 responses arriving within this many seconds of each other are treated
+# as a single throttling event by the request limiter.
+THROTTLE_COOLDOWN = 5.0
+
+# Files are base64-encoded in blocks of this many bytes.  A multiple of 3
+# encodes without padding, so the encoded blocks can simply be concatenated.
+ENCODE_BLOCK_SIZE = 3 * 64 * 1024
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+_worker_output = threading.local()
+
+
+def log(message: str) -> None:
+    """Print *message*, or buffer it when called from a deploy worker.
+
+    Workers collect their output and hand it back to the main thread so
+    that lines belonging to different items are never interleaved.
+    """
+    lines = getattr(_worker_output, "lines", None)
+    if lines is None:
+        print(message)
+    else:
+        lines.append(message)
+
+
+# ---------------------------------------------------------------------------
+# Request throttling
+# ---------------------------------------------------------------------------
+
+class AdaptiveLimiter:
+    """
+    Cap the number of in-flight API requests and adapt the cap to Fabric
+    throttling (additive increase / multiplicative decrease).
+
+    A 429 halves the limit, never below 1; a burst of 429s within
+    THROTTLE_COOLDOWN counts once.  Every ``limit`` successful responses
+    raise the limit by one again, up to *max_limit*.
+    """
+
+    def __init__(self, max_limit: int) -> None:
+        self.max_limit  = max_limit
+        self.limit      = max_limit
+        self.min_limit  = max_limit   # lowest limit reached, for the summary
+        self._in_flight = 0
+        self._successes = 0
+        self._last_cut  = float("-inf")
+        self._cond      = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def on_success(self) -> None:
+        with self._cond:
+            if self.limit >= self.max_limit:
+                return
+            self._successes += 1
+            if self._successes >= self.limit:
+                self._successes = 0
+                self.limit += 1
+                self._cond.notify()
+
+    def on_throttled(self) -> None:
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_cut < THROTTLE_COOLDOWN:
+                return
+            self._last_cut  = now
+            self._successes = 0
+            self.limit      = max(1, self.limit // 2)
+            self.min_limit  = min(self.min_limit, self.limit)
+            limit = self.limit
+        log(f"      Throttled by Fabric – request concurrency limit now {limit}")
+
+
+REQUEST_LIMITER = AdaptiveLimiter(MAX_WORKERS)
+
+
+class _ThrottleAwareRetry(Retry):
+    """Retry policy that reports every 429 response to REQUEST_LIMITER."""
+
+    def increment(self, method=None, url=None, response=None, *args, **kwargs):
+        if response is not None and response.status == 429:
+            REQUEST_LIMITER.on_throttled()
+        return super().increment(method, url, response, *args, **kwargs)
+
+
+class _LimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that holds a REQUEST_LIMITER permit for every request,
+    including any retries urllib3 performs for it.
+
+    Unless the caller streams, the response body is read while the permit
+    is held, so large downloads count against the limit as well."""
+
+    def send(self, request, stream=False, **kwargs):
+        REQUEST_LIMITER.acquire()
+        try:
+            resp = super().send(request, stream=stream, **kwargs)
+            if not stream:
+                resp.content  # read the body before giving the permit back
+        finally:
+            REQUEST_LIMITER.release()
+        if resp.status_code != 429:
+            REQUEST_LIMITER.on_success()
+        return resp
+
+
+# Transient failures (throttling, gateway errors) are retried by the HTTP
+# adapter with exponential backoff, honouring any Retry-After header.
+# Read and other post-send errors are never retried: the request may
+# already have been applied, and re-sending a create-item or
+# updateDefinition POST could create duplicates.  Connection errors are
+# still retried because the request never reached the server.
+HTTP_RETRY = _ThrottleAwareRetry(
+    total=5,
+    read=0,
+    other=0,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET", "POST", "DELETE"],
+    raise_on_status=False,   # hand the final response to the caller's error handling
+)
+
 
 # ---------------------------------------------------------------------------
 # Authentication
@@ -136,6 +303,24 @@ def get_access_token(scope: str = FABRIC_SCOPE) -> str:
     return token
 
 
+def create_session(token: str) -> requests.Session:
+    """Return an authenticated session whose connection pool can serve
+    every deploy worker without discarding connections, and which retries
+    throttled or transiently failed requests."""
+    session = requests.Session()
+    adapter = _LimitedAdapter(
+        pool_connections=MAX_WORKERS,
+        pool_maxsize=MAX_WORKERS,
+        max_retries=HTTP_RETRY,
+    )
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Authorization": f"Bearer {token}",
+        "Content-Type":  "application/json",
+    })
+    return session
+
+
 # ---------------------------------------------------------------------------
 # Long-running operation poller
 # ---------------------------------------------------------------------------
@@ -145,13 +330,18 @@ def poll_lro(session: requests.Session, operation_id: str) -> dict | None:
     status_url = f"{FABRIC_BASE}/operations/{operation_id}"
     result_url = f"{FABRIC_BASE}/operations/{operation_id}/result"
 
-    for attempt in range(1, POLL_MAX + 1):
-        time.sleep(POLL_INTERVAL)
+    delay    = INITIAL_POLL_DELAY
+    deadline = time.monotonic() + TOTAL_POLL_TIMEOUT
+    attempt  = 0
+    while time.monotonic() < deadline:
+        time.sleep(delay * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER))
+        delay = min(delay * POLL_MULTIPLIER, MAX_POLL_DELAY)
+        attempt += 1
         resp = session.get(status_url, timeout=30)
         resp.raise_for_status()
         body   = resp.json()
         status = body.get("status", "").lower()
-        print(f"      Polling {operation_id}: {status} (attempt {attempt}/{POLL_MAX})")
+        log(f"      Polling {operation_id}: {status} (attempt {attempt})")
 
         if status == "succeeded":
             r = session.get(result_url, timeout=60)
@@ -193,28 +383,10 @@ def handle_response(session: requests.Session, resp: requests.Response) -> dict:
 # Workspace item inventory
 # ---------------------------------------------------------------------------
 
-def list_workspace_items(session: requests.Session) -> dict[tuple[str, str], str]:
-    """
-    Return a dict mapping (displayName_lower, type_lower) → item_id for all
-    items currently in the target workspace.
-    """
-    index: dict[tuple[str, str], str] = {}
-    url = f"{FABRIC_BASE}/workspaces/{TARGET_WORKSPACE_ID}/items"
-    while url:
-        resp = session.get(url, timeout=60)
-        resp.raise_for_status()
-        body = resp.json()
-        for item in body.get("value", []):
-            key = (item.get("displayName", "").lower(), item.get("type", "").lower())
-            index[key] = item["id"]
-        url = body.get("continuationUri")
-    return index
-
-
-def list_workspace_items_full(session: requests.Session) -> list[dict]:
+def list_workspace_items(session: requests.Session) -> list[dict]:
     """
     Return the full item dicts for every item in the target workspace.
-    Used to identify items that should be deleted.
+    Handles pagination via continuationUri.
     """
     items = []
     url = f"{FABRIC_BASE}/workspaces/{TARGET_WORKSPACE_ID}/items"
@@ -231,54 +403,130 @@ def list_workspace_items_full(session: requests.Session) -> list[dict]:
 # Definition builder
 # ---------------------------------------------------------------------------
 
+def _scan_files(root: str, suffix: str | None = None) -> list[tuple[str, str]]:
+    """
+    Return ``(relative_posix_path, full_path)`` for every file under *root*
+    (only those whose name ends with *suffix*, if given), sorted by relative
+    path.
+
+    Walks the tree with an explicit os.scandir stack.  DirEntry carries the
+    entry type from the directory listing itself, so no per-entry stat()
+    call or pathlib object is needed.
+    """
+    files: list[tuple[str, str]] = []
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file() and (suffix is None or entry.name.endswith(suffix)):
+                    rel = os.path.relpath(entry.path, root).replace(os.sep, "/")
+                    files.append((rel, entry.path))
+    files.sort()
+    return files
+
+
+def _encode_file(file_path: str) -> str:
+    """
+    Return the base64 encoding of *file_path*.
+
+    The file is encoded block by block so that the raw bytes and the
+    encoded copy never have to be held in memory at the same time.  The
+    output buffer is sized up front from the file size, so it is never
+    reallocated while it grows.
+    """
+    with open(file_path, "rb") as f:
+        size    = os.fstat(f.fileno()).st_size
+        encoded = bytearray(4 * ((size + 2) // 3))
+        pos     = 0
+        while block := f.read(ENCODE_BLOCK_SIZE):
+            chunk = base64.b64encode(block)
+            encoded[pos:pos + len(chunk)] = chunk
+            pos += len(chunk)
+    del encoded[pos:]  # file shrank since fstat
+    return encoded.decode("ascii")
+
+
+def _encode_part(rel: str, file_path: str) -> dict:
+    """Read *file_path* and return it as a base64-encoded definition part."""
+    return {
+        "path":        rel,
+        "payload":     _encode_file(file_path),
+        "payloadType": "InlineBase64",
+    }
+
+
 def build_parts(item_dir: pathlib.Path) -> list[dict]:
     """
     Walk `item_dir` and return a list of base64-encoded part dicts
     ready for the Fabric API, excluding the .platform metadata file.
+
+    Files are read and encoded on a small thread pool; file reads and
+    base64 encoding both release the GIL.  Parts are returned in sorted
+    path order regardless of which file finishes first.
     """
-    parts = []
-    for file_path in sorted(item_dir.rglob("*")):
-        if not file_path.is_file():
-            continue
-        rel = file_path.relative_to(item_dir).as_posix()
-        # Skip Git-integration metadata files
-        if file_path.name in EXCLUDED_FILES:
-            continue
-        raw     = file_path.read_bytes()
-        encoded = base64.b64encode(raw).decode("ascii")
-        parts.append({
-            "path":        rel,
-            "payload":     encoded,
-            "payloadType": "InlineBase64",
-        })
-    return parts
+    files = [
+        (rel, file_path) for rel, file_path in _scan_files(str(item_dir))
+        # Skip Git-integration metadata files and leftover sync temp files
+        if os.path.basename(file_path) not in EXCLUDED_FILES
+        and not SYNC_TEMP_FILE_RE.match(os.path.basename(file_path))
+    ]
+    if len(files) <= 1:
+        return [_encode_part(rel, file_path) for rel, file_path in files]
+
+    with ThreadPoolExecutor(max_workers=min(FILE_IO_WORKERS, len(files))) as executor:
+        return list(executor.map(lambda f: _encode_part(*f), files))
 
 
 # ---------------------------------------------------------------------------
 # Content comparison  (avoids unnecessary updateDefinition calls)
 # ---------------------------------------------------------------------------
 
-def _zip_contents_signature(data: bytes) -> list[tuple[str, int, int]]:
-    """Return sorted list of (filename, CRC-32, size) for non-volatile members."""
+def _zip_contents_signature(source: bytes | pathlib.Path) -> frozenset[tuple[str, int, int]]:
+    """Return the set of (filename, CRC-32, size) for non-volatile members.
+
+    *source* is either the archive bytes or a path to the archive on disk.
+    Given a path, only the central directory is read – member data is never
+    loaded into memory.
+    """
     try:
-        with zipfile.ZipFile(io.BytesIO(data)) as z:
-            return sorted(
+        with zipfile.ZipFile(io.BytesIO(source) if isinstance(source, bytes) else source) as z:
+            return frozenset(
                 (i.filename, i.CRC, i.file_size)
                 for i in z.infolist()
                 if i.filename not in ZIP_VOLATILE_MEMBERS
             )
     except (zipfile.BadZipFile, Exception):
-        return []  # will cause a mismatch → safe to update
+        return frozenset()  # will cause a mismatch → safe to update
+
+
+def _part_name(path: str) -> str:
+    """Return the file name of a definition part path ('a/b/c.json' → 'c.json')."""
+    return path.rsplit("/", 1)[-1]
+
+
+def _is_zip_path(path: str) -> bool:
+    """Return True if the part at *path* is a ZIP-based archive."""
+    return os.path.splitext(_part_name(path))[1].lower() in ZIP_EXTENSIONS
 
 
 def _bytes_equal(a: bytes, b: bytes, path: str) -> bool:
     """Compare two byte sequences, using ZIP-aware logic for known archives."""
-    suffix = pathlib.PurePosixPath(path).suffix.lower()
-    if suffix in ZIP_EXTENSIONS:
+    if _is_zip_path(path):
         return _zip_contents_signature(a) == _zip_contents_signature(b)
     return a == b
 
 
+def _decode_payload(part: dict) -> bytes:
+    """Return the raw bytes carried by a definition part."""
+    payload_type = part.get("payloadType", "InlineBase64")
+    payload      = part.get("payload", "")
+    if payload_type == "InlineBase64":
+        return base64.b64decode(payload)
+    return payload.encode("utf-8") if isinstance(payload, str) else payload
+
+
 def get_remote_definition(
     session: requests.Session,
     item_id: str,
@@ -322,61 +570,75 @@ def get_remote_definition(
     return None
 
 
+def prefetch_remote_definition(
+    session: requests.Session,
+    item_id: str,
+    item_type: str = "",
+) -> tuple[dict | None, Exception | None]:
+    """Call get_remote_definition ahead of time, returning ``(definition, error)``.
+
+    The error is returned rather than raised so that, under run_captured,
+    the output logged before the failure is handed back along with it.
+    """
+    try:
+        return get_remote_definition(session, item_id, item_type), None
+    except Exception as exc:
+        return None, exc
+
+
 def definitions_match(
     local_parts: list[dict],
     remote_definition: dict | None,
+    item_dir: pathlib.Path | None = None,
 ) -> bool:
     """Return True if the local parts are identical to the remote definition.
 
     Compares decoded payloads byte-for-byte (or ZIP-content-aware for
     archive types).  Returns False if the remote definition is unavailable
     so that an update is always attempted in that case.
+
+    Payloads are decoded one file at a time, only once the file sets are
+    known to match, and only when the two encoded payloads differ.  When
+    *item_dir* is given, local ZIP archives are fingerprinted straight
+    from disk instead of from their base64 payload.
     """
     if remote_definition is None:
         return False
 
-    remote_parts = remote_definition.get("parts", [])
-
-    # Build lookup: path → decoded bytes for remote
-    remote_by_path: dict[str, bytes] = {}
-    for part in remote_parts:
+    # Build lookup: path → part for remote (skipping .platform) and local
+    remote_by_path: dict[str, dict] = {}
+    for part in remote_definition.get("parts", []):
         path = part.get("path", "")
-        # Skip .platform in remote too
-        if pathlib.PurePosixPath(path).name in EXCLUDED_FILES:
+        if _part_name(path) in EXCLUDED_FILES:
             continue
-        payload_type = part.get("payloadType", "InlineBase64")
-        payload      = part.get("payload", "")
-        if payload_type == "InlineBase64":
-            remote_by_path[path] = base64.b64decode(payload)
-        else:
-            remote_by_path[path] = payload.encode("utf-8") if isinstance(payload, str) else payload
-
-    # Build lookup: path → decoded bytes for local
-    local_by_path: dict[str, bytes] = {}
-    for part in local_parts:
-        path = part.get("path", "")
-        payload_type = part.get("payloadType", "InlineBase64")
-        payload      = part.get("payload", "")
-        if payload_type == "InlineBase64":
-            local_by_path[path] = base64.b64decode(payload)
-        else:
-            local_by_path[path] = payload.encode("utf-8") if isinstance(payload, str) else payload
+        remote_by_path[path] = part
+    local_by_path = {part.get("path", ""): part for part in local_parts}
 
     # Compare file sets
-    if set(local_by_path.keys()) != set(remote_by_path.keys()):
-        local_only  = set(local_by_path.keys()) - set(remote_by_path.keys())
-        remote_only = set(remote_by_path.keys()) - set(local_by_path.keys())
+    if local_by_path.keys() != remote_by_path.keys():
+        local_only  = local_by_path.keys() - remote_by_path.keys()
+        remote_only = remote_by_path.keys() - local_by_path.keys()
         if local_only:
-            print(f"      File set mismatch – local only: {local_only}")
+            log(f"      File set mismatch – local only: {local_only}")
         if remote_only:
-            print(f"      File set mismatch – remote only: {remote_only}")
+            log(f"      File set mismatch – remote only: {remote_only}")
         return False
 
     # Compare content of each file
-    for path, local_data in local_by_path.items():
-        remote_data = remote_by_path[path]
-        if not _bytes_equal(local_data, remote_data, path):
-            print(f"      Content differs: {path}")
+    for path, local_part in local_by_path.items():
+        remote_part = remote_by_path[path]
+        # Identical payload strings are identical content; only decode when
+        # the encodings differ (ZIP archives, non-canonical base64, …).
+        if (local_part.get("payload") == remote_part.get("payload")
+                and local_part.get("payloadType") == remote_part.get("payloadType")):
+            continue
+        remote_data = _decode_payload(remote_part)
+        if item_dir is not None and _is_zip_path(path):
+            equal = _zip_contents_signature(item_dir / path) == _zip_contents_signature(remote_data)
+        else:
+            equal = _bytes_equal(_decode_payload(local_part), remote_data, path)
+        if not equal:
+            log(f"      Content differs: {path}")
             return False
 
     return True
@@ -475,35 +737,170 @@ def delete_item(session: requests.Session, item_id: str) -> None:
         raise RuntimeError(f"Delete failed ({resp.status_code}): {msg}")
 
 
+def run_captured(fn, *args) -> tuple:
+    """
+    Call ``fn(*args)`` on a worker thread, collecting everything it logs.
+
+    Returns ``(result, output_lines)`` so the caller can print the output as
+    one block once the call has finished.
+    """
+    _worker_output.lines = []
+    try:
+        return fn(*args), _worker_output.lines
+    finally:
+        del _worker_output.lines
+
+
+def deploy_item(
+    session: requests.Session,
+    display_name: str,
+    item_type: str,
+    item_dir: pathlib.Path,
+    existing: dict[tuple[str, str], str],
+    lock: threading.Lock,
+    prefetched: Future | None = None,
+) -> tuple[str, list[str]]:
+    """
+    Create or update a single repo item in the target workspace.
+
+    Runs on a worker thread.  Returns ``(outcome, output_lines)`` where
+    *outcome* is one of the ``results`` counter keys and *output_lines* is
+    everything logged while the item was being deployed.
+
+    *prefetched*, if given, is a future for the ``run_captured`` result of
+    ``prefetch_remote_definition`` for this item, started ahead of time by
+    main().  If the prefetch failed, its output and error are logged and
+    the definition is fetched again.
+    """
+    return run_captured(
+        _deploy_item, session, display_name, item_type, item_dir, existing, lock, prefetched,
+    )
+
+
+def _deploy_item(
+    session: requests.Session,
+    display_name: str,
+    item_type: str,
+    item_dir: pathlib.Path,
+    existing: dict[tuple[str, str], str],
+    lock: threading.Lock,
+    prefetched: Future | None = None,
+) -> str:
+    lookup_key = (display_name.lower(), item_type.lower())
+    with lock:
+        existing_id = existing.get(lookup_key)
+
+    # ── Metadata-only types (Lakehouse, Environment, …) ──────────────────
+    # These cannot be updated via the definition API and cannot be safely
+    # deleted when other items depend on them.  If the item already exists
+    # in the target workspace it is left as-is; otherwise it is created.
+    if item_type in METADATA_ONLY_TYPES:
+        if existing_id:
+            log(f"    OK – already exists ({existing_id}), skipping (metadata-only type)")
+            return "skipped"
+        log("    Creating item (metadata-only – no definition upload) …")
+        try:
+            new_id = create_item_no_definition(session, display_name, item_type)
+        except Exception as exc:
+            log(f"    ERROR – {exc}")
+            return "errors"
+        log(f"    ✓ Created  {new_id}")
+        with lock:
+            existing[lookup_key] = new_id
+        return "created"
+
+    # ── Normal types with deployable definitions ─────────────────────────
+    parts = build_parts(item_dir)
+    if not parts:
+        log("    SKIP – no deployable files found in folder")
+        return "skipped"
+
+    try:
+        if existing_id:
+            # ── Compare with remote before updating ──────────────────
+            log(f"    Comparing with remote definition {existing_id} …")
+            if prefetched is not None:
+                (remote_def, fetch_error), fetch_output = prefetched.result()
+                for line in fetch_output:
+                    log(line)
+                if fetch_error is not None:
+                    log(f"    Prefetch failed ({fetch_error}) – fetching again …")
+                    remote_def = get_remote_definition(session, existing_id, item_type)
+            else:
+                remote_def = get_remote_definition(session, existing_id, item_type)
+            if definitions_match(parts, remote_def, item_dir):
+                log("    — No changes detected, skipping update")
+                return "skipped"
+            log(f"    Updating existing item {existing_id} …")
+            update_item_definition(session, existing_id, parts, item_type)
+            log("    ✓ Updated")
+            return "deployed"
+
+        log("    Creating new item …")
+        new_id = create_item_with_definition(session, display_name, item_type, parts)
+        log(f"    ✓ Created  {new_id}")
+        with lock:
+            existing[lookup_key] = new_id
+        return "created"
+
+    except Exception as exc:
+        log(f"    ERROR – {exc}")
+        return "errors"
+
+
 # ---------------------------------------------------------------------------
 # Directory scanner
 # ---------------------------------------------------------------------------
 
+def parse_item_folder(folder_name: str) -> tuple[str, str] | None:
+    """
+    Split an item folder name into ``(display_name, item_type)``, or
+    return ``None`` if it is not of the form ``<DisplayName>.<ItemType>``.
+    """
+    m = ITEM_DIR_RE.match(folder_name)
+    return (m.group(1), m.group(2)) if m else None
+
+
+@functools.lru_cache(maxsize=None)
+def scan_item_folders(source: pathlib.Path) -> tuple[tuple[str, tuple[str, str] | None], ...]:
+    """
+    Return ``(folder_name, parse_item_folder(folder_name))`` for every
+    directory directly under *source*, sorted by folder name.
+
+    The source tree does not change during a run, so it is listed and parsed
+    once and the result is shared by every step that walks it.
+    """
+    with os.scandir(source) as it:
+        # workspace_manifest.json and any stray files at the root are ignored
+        folder_names = sorted(entry.name for entry in it if entry.is_dir())
+    return tuple((name, parse_item_folder(name)) for name in folder_names)
+
+
 def iter_item_dirs(source: pathlib.Path):
     """
     Yield (display_name, item_type, item_dir) for each <Name>.<Type>
     folder directly under source.
     """
-    for item_dir in sorted(source.iterdir()):
-        if not item_dir.is_dir():
-            continue
-        # workspace_manifest.json and any stray files at the root are ignored
-        folder_name = item_dir.name
-        # Split on the LAST dot to separate display name from item type
-        # e.g. "My.Report.Report" → name="My.Report", type="Report"
-        dot_pos = folder_name.rfind(".")
-        if dot_pos == -1:
+    for folder_name, parsed in scan_item_folders(source):
+        if not parsed:
             print(f"  SKIP  {folder_name}  (no '.' type separator in folder name)")
             continue
-        display_name = folder_name[:dot_pos]
-        item_type    = folder_name[dot_pos + 1:]
-        yield display_name, item_type, item_dir
+        display_name, item_type = parsed
+        yield display_name, item_type, source / folder_name
 
 
 # ---------------------------------------------------------------------------
 # Dependency resolution
 # ---------------------------------------------------------------------------
 
+# A run of consecutive "# META ..." lines ("# METADATA ****" banners excluded)
+_META_BLOCK_RE  = re.compile(r"(?:^[ \t]*# META(?:[ \t].*)?(?:\n|\Z))+", re.MULTILINE)
+_META_PREFIX_RE = re.compile(r"^[ \t]*# META[ \t]?", re.MULTILINE)
+# A "{" opening a top-level object once the META prefix is stripped
+_META_START_RE  = re.compile(r"^\{", re.MULTILINE)
+_JSON_DECODER   = json.JSONDecoder()
+
+
 def _extract_meta_json(content: str) -> list[dict]:
     """
     Extract all META JSON blocks from notebook .py content.
@@ -512,49 +909,25 @@ def _extract_meta_json(content: str) -> list[dict]:
         # META {
         # META   "key": "value"
         # META }
-    We strip the ``# META `` prefix from each line, track brace depth, and
-    parse the resulting JSON when the top-level block closes.
+    Each run of consecutive META lines is found with one regex scan, the
+    ``# META `` prefixes are stripped in a single substitution, and the
+    JSON objects in the remaining text are decoded in turn.  A malformed
+    object is skipped and decoding resumes at the next line that opens a
+    new top-level object.
     """
-    PREFIX = "# META"
     results: list[dict] = []
-    current_lines: list[str] = []
-    in_meta = False
-    brace_depth = 0
-
-    for line in content.splitlines():
-        stripped = line.strip()
-        if not stripped.startswith(PREFIX):
-            if in_meta:
-                # end of contiguous META lines – reset
-                in_meta = False
-                current_lines.clear()
-                brace_depth = 0
-            continue
-
-        json_part = stripped[len(PREFIX):].strip()
-        if not json_part:
-            continue
-
-        if not in_meta:
-            if "{" in json_part:
-                in_meta = True
-                brace_depth = 0
-                current_lines = []
-            else:
-                continue
-
-        current_lines.append(json_part)
-        brace_depth += json_part.count("{") - json_part.count("}")
-
-        if brace_depth <= 0 and in_meta:
-            json_str = "\n".join(current_lines)
+    for block in _META_BLOCK_RE.finditer(content):
+        text = _META_PREFIX_RE.sub("", block.group())
+        pos = text.find("{")
+        while pos != -1:
             try:
-                results.append(json.loads(json_str))
+                obj, end = _JSON_DECODER.raw_decode(text, pos)
             except json.JSONDecodeError:
-                pass
-            current_lines = []
-            in_meta = False
-
+                match = _META_START_RE.search(text, pos + 1)
+                pos = match.start() if match else -1
+                continue
+            results.append(obj)
+            pos = text.find("{", end)
     return results
 
 
@@ -569,8 +942,9 @@ def _parse_notebook_deps(
     Returns a set of repo folder names that this notebook depends on.
     """
     deps: set[str] = set()
-    for py_file in item_dir.rglob("*.py"):
-        content = py_file.read_text(encoding="utf-8", errors="replace")
+    for _, py_file in _scan_files(str(item_dir), ".py"):
+        with open(py_file, encoding="utf-8", errors="replace") as f:
+            content = f.read()
         for meta in _extract_meta_json(content):
             dependencies = meta.get("dependencies", {})
 
@@ -578,7 +952,7 @@ def _parse_notebook_deps(
             lakehouse = dependencies.get("lakehouse", {})
             lh_name = lakehouse.get("default_lakehouse_name")
             if lh_name:
-                key = f"{lh_name}.lakehouse"
+                key = f"{lh_name}.lakehouse".lower()
                 if key in name_index:
                     deps.add(name_index[key])
 
@@ -597,17 +971,19 @@ def _parse_semantic_model_deps(
     """
     Scan .tmdl files for Sql.Database() calls (indicating a Lakehouse
     SQL endpoint dependency).
+
+    The probe is a plain byte search, so files are never decoded, and the
+    scan stops at the first match since every match yields the same deps.
     """
-    deps: set[str] = set()
-    for tmdl_file in item_dir.rglob("*.tmdl"):
-        content = tmdl_file.read_text(encoding="utf-8", errors="replace")
-        if "Sql.Database" in content:
+    for _, tmdl_file in _scan_files(str(item_dir), ".tmdl"):
+        with open(tmdl_file, "rb") as f:
+            found = f.read().find(b"Sql.Database") != -1
+        if found:
             # The connection string contains workspace-specific GUIDs which
             # cannot be directly mapped to a repo folder name.  Include all
             # Lakehouse items as dependencies.
-            for lh_folder in type_index.get("lakehouse", []):
-                deps.add(lh_folder)
-    return deps
+            return set(type_index.get("lakehouse", []))
+    return set()
 
 
 def _parse_report_deps(
@@ -619,8 +995,9 @@ def _parse_report_deps(
     Scan .pbir files for datasetReference → semantic model dependency.
     """
     deps: set[str] = set()
-    for pbir_file in item_dir.rglob("*.pbir"):
-        content = pbir_file.read_text(encoding="utf-8", errors="replace")
+    for _, pbir_file in _scan_files(str(item_dir), ".pbir"):
+        with open(pbir_file, encoding="utf-8", errors="replace") as f:
+            content = f.read()
         try:
             pbir = json.loads(content)
         except json.JSONDecodeError:
@@ -629,7 +1006,7 @@ def _parse_report_deps(
         by_path = ds_ref.get("byPath", {})
         ds_name = by_path.get("datasetName")
         if ds_name:
-            key = f"{ds_name}.semanticmodel"
+            key = f"{ds_name}.semanticmodel".lower()
             if key in name_index:
                 deps.add(name_index[key])
     return deps
@@ -652,29 +1029,28 @@ def build_dependency_graph(source: pathlib.Path) -> dict[str, set[str]]:
     """
     name_index: dict[str, str] = {}
     type_index: dict[str, list[str]] = {}
+    folder_types: dict[str, str] = {}   # folder name → lower-cased item type
 
-    for item_dir in sorted(source.iterdir()):
-        if not item_dir.is_dir():
-            continue
-        folder = item_dir.name
-        dot_pos = folder.rfind(".")
-        if dot_pos == -1:
+    for folder, parsed in scan_item_folders(source):
+        if not parsed:
             continue
-        item_type = folder[dot_pos + 1:]
+        item_type = parsed[1].lower()
         name_index[folder.lower()] = folder
-        type_index.setdefault(item_type.lower(), []).append(folder)
-
-    graph: dict[str, set[str]] = {}
-    for folder in name_index.values():
-        dot_pos = folder.rfind(".")
-        item_type = folder[dot_pos + 1:].lower()
-        item_dir = source / folder
-
-        parser = _DEP_PARSERS.get(item_type)
-        if parser:
-            graph[folder] = parser(item_dir, name_index, type_index)
-        else:
-            graph[folder] = set()
+        type_index.setdefault(item_type, []).append(folder)
+        folder_types[folder] = item_type
+
+    graph: dict[str, set[str]] = {folder: set() for folder in folder_types}
+
+    # Item folders are scanned concurrently; the parsers spend most of their
+    # time reading files.
+    with ThreadPoolExecutor(max_workers=FILE_IO_WORKERS) as executor:
+        futures = {
+            executor.submit(parser, source / folder, name_index, type_index): folder
+            for folder, item_type in folder_types.items()
+            if (parser := _DEP_PARSERS.get(item_type))
+        }
+        for future in as_completed(futures):
+            graph[futures[future]] = future.result()
 
     return graph
 
@@ -716,6 +1092,26 @@ def topo_sort(items: set[str], graph: dict[str, set[str]]) -> list[str]:
     return result
 
 
+def topo_levels(items: set[str], graph: dict[str, set[str]]) -> list[list[str]]:
+    """
+    Group *items* into dependency levels.
+
+    Every item depends only on items in earlier levels, so the items within a
+    single level can be deployed concurrently.
+    """
+    level_of: dict[str, int] = {}
+    for item in topo_sort(items, graph):
+        level_of[item] = 1 + max(
+            (level_of[dep] for dep in graph.get(item, set()) if dep in level_of),
+            default=-1,
+        )
+
+    levels: list[list[str]] = [[] for _ in range(max(level_of.values(), default=-1) + 1)]
+    for item in sorted(level_of):
+        levels[level_of[item]].append(item)
+    return levels
+
+
 def find_item_folder(source: pathlib.Path, user_input: str) -> str | None:
     """
     Case-insensitive match of *user_input* against folder names under *source*.
@@ -723,9 +1119,9 @@ def find_item_folder(source: pathlib.Path, user_input: str) -> str | None:
     Returns the actual folder name or ``None``.
     """
     target = user_input.strip().lower()
-    for item_dir in sorted(source.iterdir()):
-        if item_dir.is_dir() and item_dir.name.lower() == target:
-            return item_dir.name
+    for folder_name, _ in scan_item_folders(source):
+        if folder_name.lower() == target:
+            return folder_name
     return None
 
 
@@ -750,6 +1146,8 @@ def main():
 
     # ── 0. Resolve deploy set (selective mode) ───────────────────────────────
     deploy_folders: set[str] | None = None  # None ⇒ deploy everything
+    # Built once; shared by dependency resolution and deploy ordering below.
+    dep_graph = build_dependency_graph(SOURCE_ROOT)
 
     if selective:
         matched_folder = find_item_folder(SOURCE_ROOT, DEPLOY_ITEM)
@@ -757,13 +1155,12 @@ def main():
             print(f"\nERROR: No item matching '{DEPLOY_ITEM}' found in {SOURCE_ROOT}/",
                   file=sys.stderr)
             print("Available items:", file=sys.stderr)
-            for d in sorted(SOURCE_ROOT.iterdir()):
-                if d.is_dir() and "." in d.name:
-                    print(f"  • {d.name}", file=sys.stderr)
+            for folder_name, parsed in scan_item_folders(SOURCE_ROOT):
+                if parsed:
+                    print(f"  • {folder_name}", file=sys.stderr)
             sys.exit(1)
 
         print(f"\n[0] Resolving dependencies for {matched_folder} …")
-        dep_graph = build_dependency_graph(SOURCE_ROOT)
         deploy_folders = resolve_transitive(dep_graph, matched_folder)
         ordered = topo_sort(deploy_folders, dep_graph)
         print(f"  Will deploy {len(deploy_folders)} item(s) (in dependency order):")
@@ -775,17 +1172,18 @@ def main():
     step = "[1/3]" if selective else "[1/4]"
     print(f"\n{step} Authenticating as Service Principal …")
     token   = get_access_token()
-    session = requests.Session()
-    session.headers.update({
-        "Authorization": f"Bearer {token}",
-        "Content-Type":  "application/json",
-    })
+    session = create_session(token)
     print("  Fabric token  OK")
 
     # ── 2. Inventory target workspace ────────────────────────────────────────
     step = "[2/3]" if selective else "[2/4]"
     print(f"\n{step} Inventorying target workspace …")
-    existing = list_workspace_items(session)
+    ws_items = list_workspace_items(session)
+    # (displayName_lower, type_lower) → item_id
+    existing: dict[tuple[str, str], str] = {
+        (item.get("displayName", "").lower(), item.get("type", "").lower()): item["id"]
+        for item in ws_items
+    }
     print(f"  Found {len(existing)} existing item(s) in workspace")
 
     # ── 3. Deploy items ──────────────────────────────────────────────────────
@@ -796,109 +1194,102 @@ def main():
     # Track which (name, type) keys are in the repo so we can delete extras
     repo_keys: set[tuple[str, str]] = set()
 
-    # Determine iteration order
+    # Determine deploy order.  Items are grouped into dependency levels so
+    # that every item's dependencies exist before it is deployed, while the
+    # items within a level are deployed concurrently.
     if selective:
-        # Use the topologically sorted list so deps are created first
-        ordered_items = []
-        ordered_set = topo_sort(deploy_folders, dep_graph)  # type: ignore[arg-type]
-        for folder_name in ordered_set:
-            dot_pos = folder_name.rfind(".")
-            if dot_pos == -1:
+        entries = {}
+        parsed_folders = dict(scan_item_folders(SOURCE_ROOT))
+        for folder_name in deploy_folders:  # type: ignore[union-attr]
+            parsed = parsed_folders.get(folder_name)
+            if not parsed:
                 continue
-            display_name = folder_name[:dot_pos]
-            item_type = folder_name[dot_pos + 1:]
-            item_dir = SOURCE_ROOT / folder_name
-            ordered_items.append((display_name, item_type, item_dir))
+            display_name, item_type = parsed
+            entries[folder_name] = (display_name, item_type, SOURCE_ROOT / folder_name)
     else:
-        ordered_items = list(iter_item_dirs(SOURCE_ROOT))
-
-    for display_name, item_type, item_dir in ordered_items:
-        print(f"\n  [{item_type}]  {display_name}")
-
-        if item_type in NO_DEPLOY_TYPES:
-            print(f"    SKIP – {item_type} cannot be deployed via definition API")
-            results["skipped"] += 1
-            continue
-
-        lookup_key = (display_name.lower(), item_type.lower())
-        repo_keys.add(lookup_key)
-        existing_id = existing.get(lookup_key)
-
-        # ── Metadata-only types (Lakehouse, Environment, …) ──────────────
-        # These cannot be updated via the definition API and cannot be safely
-        # deleted when other items depend on them.  If the item already exists
-        # in the target workspace it is left as-is; otherwise it is created.
-        if item_type in METADATA_ONLY_TYPES:
-            if existing_id:
-                print(f"    OK – already exists ({existing_id}), skipping (metadata-only type)")
-                results["skipped"] += 1
-            else:
-                print("    Creating item (metadata-only – no definition upload) …")
-                try:
-                    new_id = create_item_no_definition(session, display_name, item_type)
-                    print(f"    ✓ Created  {new_id}")
-                    existing[lookup_key] = new_id
-                    results["created"] += 1
-                except Exception as exc:
-                    print(f"    ERROR – {exc}")
-                    results["errors"] += 1
-            continue
-
-        # ── Normal types with deployable definitions ─────────────────────
-        parts = build_parts(item_dir)
-        if not parts:
-            print("    SKIP – no deployable files found in folder")
-            results["skipped"] += 1
-            continue
-
-        try:
-            if existing_id:
-                # ── Compare with remote before updating ──────────────
-                print(f"    Comparing with remote definition {existing_id} …")
-                remote_def = get_remote_definition(session, existing_id, item_type)
-                if definitions_match(parts, remote_def):
-                    print("    — No changes detected, skipping update")
+        entries = {
+            item_dir.name: (display_name, item_type, item_dir)
+            for display_name, item_type, item_dir in iter_item_dirs(SOURCE_ROOT)
+        }
+    levels = topo_levels(set(entries), dep_graph)
+
+    lock = threading.Lock()
+    # getDefinition futures for existing items beyond the first level
+    prefetched: dict[str, Future] = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for level_no, level in enumerate(levels):
+            futures = {}
+            for folder_name in level:
+                display_name, item_type, item_dir = entries[folder_name]
+                type_lc = item_type.lower()
+
+                if type_lc in NO_DEPLOY_TYPES_LC:
+                    print(f"\n  [{item_type}]  {display_name}")
+                    print(f"    SKIP – {item_type} cannot be deployed via definition API")
                     results["skipped"] += 1
                     continue
-                print(f"    Updating existing item {existing_id} …")
-                update_item_definition(session, existing_id, parts, item_type)
-                print("    ✓ Updated")
-                results["deployed"] += 1
-            else:
-                print("    Creating new item …")
-                new_id = create_item_with_definition(session, display_name, item_type, parts)
-                print(f"    ✓ Created  {new_id}")
-                existing[lookup_key] = new_id
-                results["created"] += 1
-
-        except UpdateFailed as exc:
-            print(f"    ERROR – {exc}")
-            results["errors"] += 1
-        except Exception as exc:
-            print(f"    ERROR – {exc}")
-            results["errors"] += 1
 
-    # ── 4. Delete workspace items not in the repo (full deploy only) ─────────
-    if selective:
-        print("\n  (Selective deploy – skipping delete step)")
-    else:
-        print("\n[4/4] Removing items not present in repo …")
-        # Re-fetch full item list to catch any items not matched during deploy
-        all_ws_items = list_workspace_items_full(session)
-        for ws_item in all_ws_items:
-            ws_name = ws_item.get("displayName", "")
-            ws_type = ws_item.get("type", "")
-            ws_key  = (ws_name.lower(), ws_type.lower())
-            ws_id   = ws_item["id"]
-
-            # Skip types that have no repo representation
-            if ws_type in NO_DEPLOY_TYPES:
-                continue
-
-            if ws_key not in repo_keys:
-                print(f"  [{ws_type}]  {ws_name}")
+                repo_keys.add((display_name.lower(), type_lc))
+                future = executor.submit(
+                    deploy_item, session, display_name, item_type, item_dir, existing, lock,
+                    prefetched.pop(folder_name, None),
+                )
+                futures[future] = (display_name, item_type)
+
+            if level_no == 0:
+                # A remote definition does not change when the item's
+                # dependencies are deployed, so the comparisons for later
+                # levels can be downloaded while the first level deploys.
+                # They are queued behind the first level and ahead of every
+                # item that will wait on them.
+                for folder_name in (f for later in levels[1:] for f in later):
+                    display_name, item_type, _ = entries[folder_name]
+                    if (item_type in METADATA_ONLY_TYPES
+                            or item_type.lower() in NO_DEPLOY_TYPES_LC):
+                        continue
+                    with lock:
+                        existing_id = existing.get((display_name.lower(), item_type.lower()))
+                    if existing_id:
+                        prefetched[folder_name] = executor.submit(
+                            run_captured, prefetch_remote_definition, session, existing_id, item_type,
+                        )
+
+            # Wait for the whole level before starting the items that depend on it
+            for future in as_completed(futures):
+                display_name, item_type = futures[future]
+                try:
+                    outcome, output = future.result()
+                except Exception as exc:
+                    outcome, output = "errors", [f"    ERROR – {exc}"]
+                # One write per item keeps the main thread off the stdout
+                # lock for all but one call per finished item.
+                print("\n".join([f"\n  [{item_type}]  {display_name}", *output]))
+                results[outcome] += 1
+
+        # ── 4. Delete workspace items not in the repo (full deploy only) ─────
+        if selective:
+            print("\n  (Selective deploy – skipping delete step)")
+        else:
+            print("\n[4/4] Removing items not present in repo …")
+            # Items created during the deploy are all in repo_keys, so the
+            # inventory taken in step 2 is sufficient to find the extras.
+            to_delete = [
+                ws_item for ws_item in ws_items
+                # Skip types that have no repo representation
+                if ws_item.get("type", "").lower() not in NO_DEPLOY_TYPES_LC
+                and (ws_item.get("displayName", "").lower(),
+                     ws_item.get("type", "").lower()) not in repo_keys
+            ]
+            futures = {
+                executor.submit(delete_item, session, ws_item["id"]): ws_item
+                for ws_item in to_delete
+            }
+            for future in as_completed(futures):
+                ws_item = futures[future]
+                ws_id   = ws_item["id"]
+                print(f"  [{ws_item.get('type', '')}]  {ws_item.get('displayName', '')}")
                 try:
-                    delete_item(session, ws_id)
+                    future.result()
                     print(f"    ✓ Deleted  {ws_id}")
                     results["deleted"] += 1
                 except Exception as exc:
@@ -910,6 +1301,9 @@ def main():
     print(f"  Deleted : {results['deleted']}")
     print(f"  Skipped : {results['skipped']}")
     print(f"  Errors  : {results['errors']}")
+    if REQUEST_LIMITER.min_limit < REQUEST_LIMITER.max_limit:
+        print(f"  Throttled – request concurrency dropped to {REQUEST_LIMITER.min_limit}"
+              f" (of {REQUEST_LIMITER.max_limit})")
 
     if results["errors"] > 0:
         print("\nDeployment completed with errors.", file=sys.stderr)
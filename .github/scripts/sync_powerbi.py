@@ -38,12 +38,17 @@ import os
 import sys
 import json
 import time
-import base64
+import binascii
 import pathlib
-import re
 import zipfile
 import io
+import threading
+import random
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -78,17 +83,78 @@ FORMAT_BY_TYPE: dict[str, str] = {
     "semanticmodel": "TMDL",
 }
 
-# Long-running operation poll settings
-POLL_INTERVAL = 5    # seconds between polls
-POLL_MAX      = 72   # 72 x 5 s = 6 min max per item
+# Long-running operation poll settings.  The delay between status checks
+# starts short (most getDefinition operations finish within a few seconds) and
+# grows geometrically up to MAX_POLL_DELAY.  Each sleep is jittered so that
+# items submitted together do not keep polling in lock-step.
+INITIAL_POLL_DELAY = 1.0    # seconds before the first status check
+POLL_MULTIPLIER    = 1.5    # growth factor applied after every check
+MAX_POLL_DELAY     = 45.0   # upper bound on the delay between checks
+POLL_JITTER        = 0.2    # each sleep is scaled by a random 1 ± POLL_JITTER
+TOTAL_POLL_TIMEOUT = 360    # 6 min max per item
+
+# Number of items downloaded concurrently.  Each item is one getDefinition
+# call, usually followed by LRO polling, so the work is network-bound.
+MAX_WORKERS = 8
+
+# Number of threads used to decode and write the parts of a single item.
+FILE_IO_WORKERS = 8
+
+# Transient failures (throttling, gateway errors) are retried by the HTTP
+# adapter with exponential backoff, honouring any Retry-After header.
+HTTP_RETRY = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET", "POST"],
+    raise_on_status=False,   # hand the final response to the caller's error handling
+)
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+_worker_output = threading.local()
+
+
+def log(message: str) -> None:
+    """Print *message*, or buffer it when called from a download worker.
+
+    Workers collect their output and hand it back to the main thread so
+    that lines belonging to different items are never interleaved.
+    """
+    lines = getattr(_worker_output, "lines", None)
+    if lines is None:
+        print(message)
+    else:
+        lines.append(message)
+
+
+def run_captured(fn, *args) -> tuple:
+    """
+    Call ``fn(*args)`` on a worker thread, collecting everything it logs.
+
+    Returns ``(result, output_lines)`` so the caller can emit the output as
+    one block once the call has finished.
+    """
+    _worker_output.lines = []
+    try:
+        return fn(*args), _worker_output.lines
+    finally:
+        del _worker_output.lines
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+# Characters that are unsafe in directory / file names, each mapped to "_"
+_UNSAFE_NAME_CHARS = str.maketrans(dict.fromkeys('\\/:*?"<>|', "_"))
+
+
 def sanitize(name: str) -> str:
     """Strip characters that are unsafe in directory / file names."""
-    return re.sub(r'[\\/:*?"<>|]', "_", name).strip()
+    return name.translate(_UNSAFE_NAME_CHARS).strip()
 
 
 def get_access_token(scope: str) -> str:
@@ -111,6 +177,24 @@ def get_access_token(scope: str) -> str:
     return token
 
 
+def create_session(token: str) -> requests.Session:
+    """Return an authenticated session whose connection pool can serve
+    every download worker without discarding connections, and which
+    retries throttled or transiently failed requests."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=MAX_WORKERS,
+        pool_maxsize=MAX_WORKERS,
+        max_retries=HTTP_RETRY,
+    )
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Authorization": f"Bearer {token}",
+        "Content-Type":  "application/json",
+    })
+    return session
+
+
 # File extensions that are ZIP archives whose raw bytes may differ between
 # exports even when the logical content is identical (embedded timestamps,
 # compression metadata, etc.).  For these we compare the *member contents*
@@ -123,30 +207,102 @@ ZIP_EXTENSIONS = {".dacpac", ".bacpac", ".nupkg"}
 # is not falsely flagged as modified.
 ZIP_VOLATILE_MEMBERS = {"DacMetadata.xml", "Origin.xml"}
 
+# JSON files whose volatile keys are ignored when deciding whether to rewrite
+# them.  .platform is Git-integration metadata that the deployer never
+# uploads; its logicalId differs between a Git-integration export and a
+# getDefinition export of the same item, so comparing it would rewrite every
+# .platform file without any meaningful change.
+JSON_VOLATILE_FILES = {".platform"}
+JSON_VOLATILE_KEYS  = {"logicalId"}
+
+# Chunk size used when comparing an existing file against new content.
+COMPARE_CHUNK_SIZE = 64 * 1024
+
+
+def _file_matches(path: pathlib.Path, data: bytes) -> bool:
+    """Return True if the file at *path* holds exactly *data*.
+
+    The file is read in chunks and the comparison stops at the first
+    difference, so a changed file is usually not read to the end and an
+    unchanged one is never held in memory as a whole.
+    """
+    view = memoryview(data)
+    pos  = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(COMPARE_CHUNK_SIZE):
+            if view[pos:pos + len(chunk)] != chunk:
+                return False
+            pos += len(chunk)
+    return pos == len(data)
+
+
+def _zip_signature(source: bytes | pathlib.Path) -> frozenset[tuple[str, int, int]]:
+    """Return the set of ``(filename, CRC-32, size)`` for non-volatile members.
+
+    *source* is either the archive bytes or a path to the archive on disk.
+    Given a path, only the central directory is read from the file.
+    """
+    with zipfile.ZipFile(io.BytesIO(source) if isinstance(source, bytes) else source) as z:
+        return frozenset(
+            (i.filename, i.CRC, i.file_size) for i in z.infolist()
+            if i.filename not in ZIP_VOLATILE_MEMBERS
+        )
+
 
-def _zip_contents_equal(a: bytes, b: bytes) -> bool:
-    """Return True if two ZIP archives contain identical member files.
+def _zip_contents_equal(path: pathlib.Path, data: bytes) -> bool:
+    """Return True if the archive at *path* and *data* contain identical member files.
 
     Compares only the central-directory metadata (file names, CRC-32
     checksums, and uncompressed sizes) without decompressing any data.
     Members listed in ``ZIP_VOLATILE_MEMBERS`` (e.g. DacMetadata.xml,
     Origin.xml) are excluded because PowerBI regenerates them with fresh
     timestamps on every export even when the schema is unchanged.
+    If either side cannot be read as an archive, the raw bytes are
+    compared instead.
     """
     try:
-        with zipfile.ZipFile(io.BytesIO(a)) as za, zipfile.ZipFile(io.BytesIO(b)) as zb:
-            entries_a = sorted(
-                (i.filename, i.CRC, i.file_size) for i in za.infolist()
-                if i.filename not in ZIP_VOLATILE_MEMBERS
-            )
-            entries_b = sorted(
-                (i.filename, i.CRC, i.file_size) for i in zb.infolist()
-                if i.filename not in ZIP_VOLATILE_MEMBERS
-            )
-            return entries_a == entries_b
-    except (zipfile.BadZipFile, Exception):
-        # If either isn't a valid ZIP, fall back to raw comparison
-        return a == b
+        return _zip_signature(path) == _zip_signature(data)
+    except (zipfile.BadZipFile, ValueError, NotImplementedError, OSError):
+        # If either isn't a readable ZIP, fall back to raw comparison
+        return path.stat().st_size == len(data) and _file_matches(path, data)
+
+
+def _without_volatile_keys(value):
+    """Return *value* with every ``JSON_VOLATILE_KEYS`` entry removed, recursively."""
+    if isinstance(value, dict):
+        return {
+            k: _without_volatile_keys(v) for k, v in value.items()
+            if k not in JSON_VOLATILE_KEYS
+        }
+    if isinstance(value, list):
+        return [_without_volatile_keys(v) for v in value]
+    return value
+
+
+def _json_contents_equal(path: pathlib.Path, data: bytes) -> bool:
+    """Return True if the JSON at *path* and *data* match, ignoring volatile keys."""
+    try:
+        existing = json.loads(path.read_bytes())
+        incoming = json.loads(data)
+    except ValueError:
+        # If either isn't valid JSON, fall back to raw comparison
+        return path.stat().st_size == len(data) and _file_matches(path, data)
+    return _without_volatile_keys(existing) == _without_volatile_keys(incoming)
+
+
+def remove_stale_temp_files(root: pathlib.Path) -> int:
+    """Delete ``.<name>.tmp`` files left under *root* by an interrupted sync.
+
+    write_file renames its temporary file over the target, so one only
+    survives if the process was killed in between.  Returns the number of
+    files removed.
+    """
+    removed = 0
+    for tmp in root.rglob(".*.tmp"):
+        if tmp.is_file():
+            tmp.unlink()
+            removed += 1
+    return removed
 
 
 def write_file(path: pathlib.Path, data: bytes) -> bool:
@@ -154,26 +310,44 @@ def write_file(path: pathlib.Path, data: bytes) -> bool:
 
     For ZIP-based formats (.dacpac, etc.) the comparison is done on the
     archive member contents rather than the raw bytes, because PowerBI
-    regenerates the ZIP envelope on every export.
+    regenerates the ZIP envelope on every export.  Files listed in
+    ``JSON_VOLATILE_FILES`` are compared as parsed JSON, ignoring
+    ``JSON_VOLATILE_KEYS``.
+
+    The parent directory must already exist.  New content is written to a
+    temporary file beside *path* and renamed over it, so an interrupted
+    sync never leaves a half-written file behind to be mistaken for a
+    change (or committed) on the next run.
 
     Returns True if the file was written (new or changed), False if skipped.
     """
-    if path.exists():
-        existing = path.read_bytes()
-        is_zip = path.suffix.lower() in ZIP_EXTENSIONS
-        contents_match = (
-            _zip_contents_equal(existing, data) if is_zip
-            else existing == data
-        )
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        size = None
+
+    if size is not None:
+        if path.suffix.lower() in ZIP_EXTENSIONS:
+            contents_match = _zip_contents_equal(path, data)
+        elif path.name in JSON_VOLATILE_FILES:
+            contents_match = _json_contents_equal(path, data)
+        else:
+            # A size mismatch settles it without reading the file
+            contents_match = size == len(data) and _file_matches(path, data)
         if contents_match:
-            print(f"      SKIP  {path}  (unchanged)")
+            log(f"      SKIP  {path}  (unchanged)")
             return False
-        print(f"      WRITE {path}  (content changed)")
+        log(f"      WRITE {path}  (content changed)")
     else:
-        print(f"      WRITE {path}  (new file)")
+        log(f"      WRITE {path}  (new file)")
 
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_bytes(data)
+    tmp = path.with_name(f".{path.name}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
     return True
 
 
@@ -241,7 +415,7 @@ def get_item_definition(
             location     = resp.headers.get("Location", "")
             operation_id = location.rstrip("/").split("/")[-1]
         if not operation_id:
-            print("      WARNING: 202 received but could not find operation ID.")
+            log("      WARNING: 202 received but could not find operation ID.")
             return None
         return _poll_lro(session, operation_id)
 
@@ -254,13 +428,18 @@ def _poll_lro(session: requests.Session, operation_id: str) -> dict | None:
     status_url = f"{FABRIC_BASE}/operations/{operation_id}"
     result_url = f"{FABRIC_BASE}/operations/{operation_id}/result"
 
-    for attempt in range(1, POLL_MAX + 1):
-        time.sleep(POLL_INTERVAL)
+    delay    = INITIAL_POLL_DELAY
+    deadline = time.monotonic() + TOTAL_POLL_TIMEOUT
+    attempt  = 0
+    while time.monotonic() < deadline:
+        time.sleep(delay * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER))
+        delay = min(delay * POLL_MULTIPLIER, MAX_POLL_DELAY)
+        attempt += 1
         resp = session.get(status_url, timeout=30)
         resp.raise_for_status()
         body   = resp.json()
         status = body.get("status", "").lower()
-        print(f"      Polling {operation_id}: {status} (attempt {attempt}/{POLL_MAX})")
+        log(f"      Polling {operation_id}: {status} (attempt {attempt})")
 
         if status == "succeeded":
             result = session.get(result_url, timeout=60)
@@ -269,10 +448,10 @@ def _poll_lro(session: requests.Session, operation_id: str) -> dict | None:
 
         if status in ("failed", "cancelled"):
             err = body.get("error", {})
-            print(f"      Operation {status}: {err.get('message', 'unknown error')}")
+            log(f"      Operation {status}: {err.get('message', 'unknown error')}")
             return None
 
-    print(f"      WARNING: operation {operation_id} timed out after polling.")
+    log(f"      WARNING: operation {operation_id} timed out after polling.")
     return None
 
 
@@ -322,9 +501,9 @@ def _analyze_notebook_content(raw: bytes, rel_path: str) -> None:
     parts.append(f"{code_cells} code cell(s)")
     parts.append(f"{markdown_cells} markdown/comment cell(s)")
     parts.append(f"{comment_lines} inline comment(s)")
-    print(f"      Notebook content: {', '.join(parts)}")
+    log(f"      Notebook content: {', '.join(parts)}")
     for preview in markdown_previews:
-        print(f"        ▸ {preview}")
+        log(f"        ▸ {preview}")
 
 
 # ---------------------------------------------------------------------------
@@ -352,48 +531,102 @@ def save_definition(item_name: str, item_type: str, definition: dict) -> tuple[i
     """
     parts = definition.get("parts", [])
     if not parts:
-        print("      WARNING: definition contained no parts.")
+        log("      WARNING: definition contained no parts.")
         return (0, 0)
 
-    written = 0
-    skipped = 0
-
     # <DisplayName>.<ItemType>  –  matches PowerBI Git integration folder naming
     item_dir = OUTPUT_ROOT / f"{sanitize(item_name)}.{item_type}"
-    for part in parts:
-        rel_path     = part.get("path", "unknown_file")
-        payload_type = part.get("payloadType", "InlineBase64")
-        payload      = part.get("payload", "")
 
-        if payload_type == "InlineBase64":
-            raw = base64.b64decode(payload)
-        else:
-            raw = payload.encode("utf-8") if isinstance(payload, str) else payload
+    # Create each distinct directory once, up front, rather than once per part
+    for parent in {(item_dir / part.get("path", "unknown_file")).parent for part in parts}:
+        parent.mkdir(parents=True, exist_ok=True)
 
-        # For Notebook items, analyse .py content to verify that
-        # markdown cells (documentation comments) and inline comments
-        # are present in the downloaded definition.
-        if item_type.lower() == "notebook" and rel_path.endswith(".py"):
-            _analyze_notebook_content(raw, rel_path)
+    if len(parts) == 1:
+        written = int(_save_part(item_dir, item_type, parts[0]))
+        return (written, 1 - written)
 
-        if write_file(item_dir / rel_path, raw):
-            written += 1
-        else:
-            skipped += 1
+    # Parts are decoded and written on a small thread pool; their output is
+    # replayed in part order afterwards so the log reads as before.
+    with ThreadPoolExecutor(max_workers=min(FILE_IO_WORKERS, len(parts))) as executor:
+        outcomes = list(executor.map(
+            lambda part: run_captured(_save_part, item_dir, item_type, part), parts,
+        ))
+
+    written = 0
+    for was_written, output in outcomes:
+        for line in output:
+            log(line)
+        written += was_written
+
+    return (written, len(parts) - written)
+
+
+def _save_part(item_dir: pathlib.Path, item_type: str, part: dict) -> bool:
+    """Decode a single definition part and write it under *item_dir*.
+
+    Returns True if the file was written (new or changed), False if skipped.
+    """
+    rel_path     = part.get("path", "unknown_file")
+    payload_type = part.get("payloadType", "InlineBase64")
+    payload      = part.get("payload", "")
+
+    if payload_type == "InlineBase64":
+        # The C primitive behind base64.b64decode; accepts the ASCII str as-is
+        raw = binascii.a2b_base64(payload)
+    else:
+        raw = payload.encode("utf-8") if isinstance(payload, str) else payload
+
+    # For Notebook items, analyse .py content to verify that
+    # markdown cells (documentation comments) and inline comments
+    # are present in the downloaded definition.
+    if item_type.lower() == "notebook" and rel_path.endswith(".py"):
+        _analyze_notebook_content(raw, rel_path)
 
-    return (written, skipped)
+    return write_file(item_dir / rel_path, raw)
+
+
+def sync_item(session: requests.Session, item: dict) -> tuple[str | None, int, int, list[str]]:
+    """
+    Download and save the definition of a single workspace item.
+
+    Runs on a worker thread.  Returns ``(skip_reason, written, unchanged,
+    output_lines)``; *skip_reason* is None when the definition was saved and
+    *output_lines* is everything logged while the item was processed.
+    """
+    (skip_reason, written, unchanged), output = run_captured(_sync_item, session, item)
+    return skip_reason, written, unchanged, output
+
+
+def _sync_item(session: requests.Session, item: dict) -> tuple[str | None, int, int]:
+    item_id   = item["id"]
+    item_name = item.get("displayName", item_id)
+    item_type = item.get("type", "Unknown")
+
+    if item_type in NO_DEFINITION_TYPES:
+        log(f"    SKIP – {item_type} does not expose a source definition")
+        return "no getDefinition support", 0, 0
+
+    try:
+        definition = get_item_definition(session, item_id, item_type)
+        if definition is None:
+            log("    SKIP – getDefinition not supported or returned nothing")
+            return "getDefinition returned nothing", 0, 0
+        written, unchanged = save_definition(item_name, item_type, definition)
+        if written > 0:
+            log(f"    ✓ {written} file(s) written, {unchanged} unchanged")
+        else:
+            log(f"    — No changes detected ({unchanged} file(s) identical)")
+        return None, written, unchanged
+    except Exception as exc:
+        log(f"    ERROR – {exc}")
+        return str(exc), 0, 0
 
 
 # ---------------------------------------------------------------------------
 # Workspace manifest
 # ---------------------------------------------------------------------------
 
-def write_manifest(items: list, skipped: list) -> None:
-    type_counts: dict[str, int] = {}
-    for item in items:
-        t = item.get("type", "Unknown")
-        type_counts[t] = type_counts.get(t, 0) + 1
-
+def write_manifest(items: list, skipped: list, type_counts: Counter) -> None:
     manifest = {
         "workspaceId":  WORKSPACE_ID,
         "syncedAt":     time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
@@ -421,11 +654,7 @@ def main():
     # ── 1. Authenticate ─────────────────────────────────────────────────────────────────────
     print("\n[1/4] Authenticating as Service Principal …")
     token   = get_access_token(FABRIC_SCOPE)
-    session = requests.Session()
-    session.headers.update({
-        "Authorization": f"Bearer {token}",
-        "Content-Type":  "application/json",
-    })
+    session = create_session(token)
     print("  Fabric token  OK")
 
     # ── 2. Discover items ────────────────────────────────────────────────────────────
@@ -433,55 +662,42 @@ def main():
     items = list_workspace_items(session)
     print(f"  Found {len(items)} item(s)")
 
-    type_counts: dict[str, int] = {}
-    for item in items:
-        t = item.get("type", "Unknown")
-        type_counts[t] = type_counts.get(t, 0) + 1
+    type_counts = Counter(item.get("type", "Unknown") for item in items)
     for t, c in sorted(type_counts.items()):
         print(f"    {t:<40} {c}")
 
     # ── 3. Download source definitions ─────────────────────────────────────────────
     print("\n[3/4] Downloading source definitions …")
+    stale = remove_stale_temp_files(OUTPUT_ROOT)
+    if stale:
+        print(f"  Removed {stale} leftover temp file(s) from an interrupted sync")
     skipped: list = []
     total_files_written  = 0
     total_files_unchanged = 0
     items_with_changes   = 0
     items_unchanged      = 0
 
-    for item in items:
-        item_id   = item["id"]
-        item_name = item.get("displayName", item_id)
-        item_type = item.get("type", "Unknown")
-
-        print(f"\n  [{item_type}]  {item_name}")
-
-        if item_type in NO_DEFINITION_TYPES:
-            print(f"    SKIP – {item_type} does not expose a source definition")
-            skipped.append({**item, "skipReason": "no getDefinition support"})
-            continue
-
-        try:
-            definition = get_item_definition(session, item_id, item_type)
-            if definition is None:
-                print("    SKIP – getDefinition not supported or returned nothing")
-                skipped.append({**item, "skipReason": "getDefinition returned nothing"})
+    # Items are downloaded concurrently; each item's output is printed as one
+    # block, in workspace order, once that item has finished.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        outcomes = executor.map(lambda item: sync_item(session, item), items)
+        for item, (skip_reason, written, unchanged, output) in zip(items, outcomes):
+            header = f"\n  [{item.get('type', 'Unknown')}]  {item.get('displayName', item['id'])}"
+            print("\n".join([header, *output]))
+
+            if skip_reason is not None:
+                skipped.append({**item, "skipReason": skip_reason})
+                continue
+            total_files_written  += written
+            total_files_unchanged += unchanged
+            if written > 0:
+                items_with_changes += 1
             else:
-                written, unchanged = save_definition(item_name, item_type, definition)
-                total_files_written  += written
-                total_files_unchanged += unchanged
-                if written > 0:
-                    items_with_changes += 1
-                    print(f"    ✓ {written} file(s) written, {unchanged} unchanged")
-                else:
-                    items_unchanged += 1
-                    print(f"    — No changes detected ({unchanged} file(s) identical)")
-        except Exception as exc:
-            print(f"    ERROR – {exc}")
-            skipped.append({**item, "skipReason": str(exc)})
+                items_unchanged += 1
 
     # ── 4. Write manifest ──────────────────────────────────────────────────
     print("\n[4/4] Writing manifest …")
-    write_manifest(items, skipped)
+    write_manifest(items, skipped, type_counts)
 
     total_saved = len(items) - len(skipped)
     print(f"\n  Items processed : {total_saved}")
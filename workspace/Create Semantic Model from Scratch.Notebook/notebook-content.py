@@ -51,8 +51,10 @@ from datetime import datetime
 # CELL ********************
 
 semantic_model_name = "demo_semantic_model"
+DEBUG = False  # Set to True to display the intermediate data frames
 workspace = fabric.get_workspace_id()
-tables = lakehouse.get_lakehouse_tables()['Table Name'].tolist()
+lakehouse_tables = lakehouse.get_lakehouse_tables()
+tables = lakehouse_tables['Table Name'].tolist()
 
 # METADATA ********************
 
@@ -63,7 +65,8 @@ tables = lakehouse.get_lakehouse_tables()['Table Name'].tolist()
 
 # CELL ********************
 
-lakehouse.get_lakehouse_tables()
+if DEBUG:
+    display(lakehouse_tables)
 
 # METADATA ********************
 
@@ -96,6 +99,7 @@ lakehouse.optimize_lakehouse_tables()
 labs.directlake.generate_direct_lake_semantic_model(
      dataset = semantic_model_name 
     ,lakehouse_tables = tables
+    ,workspace = workspace
     ,overwrite = True
 )
 
@@ -112,38 +116,23 @@ labs.directlake.generate_direct_lake_semantic_model(
 
 # MARKDOWN ********************
 
-# Reads in the contents of the ***model_relationships.csv*** file into the ***pdf_relationship_data*** data frame
+# Reads in the contents of the ***model_relationships.csv*** file into the ***pdf_relationship_data*** data frame. The data frame is displayed when ***DEBUG*** is set to True.
 
 # CELL ********************
 
 path = "/lakehouse/default/Files/model_information/model_relationships.csv"
-pdf_relationship_data = pd.read_csv(path)
-display(pdf_relationship_data)
-
-# METADATA ********************
-
-# META {
-# META   "language": "python",
-# META   "language_group": "synapse_pyspark"
-# META }
-
-# MARKDOWN ********************
-
-# Iterates over the ***pdf_relationship_data*** data frame and uses the information in the row to create the relationship using the information in the row
-
-# CELL ********************
-
-with connect_semantic_model(dataset=semantic_model_name, readonly=False) as tom:
-    for index, row in pdf_relationship_data.iterrows():
-        tom.add_relationship(
-             from_table = row['from_table']
-            ,from_column = row['from_column']
-            ,from_cardinality = row['from_cardinality']
-            ,to_table = row['to_table']
-            ,to_column = row['to_column']
-            ,to_cardinality = row['to_cardinality']
-            ,is_active = True if row['is_active'] == 1 else False        
-        )
+relationship_dtypes = {
+     "from_table": "string"
+    ,"from_column": "string"
+    ,"from_cardinality": "category"
+    ,"to_table": "string"
+    ,"to_column": "string"
+    ,"to_cardinality": "category"
+}
+# is_active is left to type inference so blank cells and True/False values still parse
+pdf_relationship_data = pd.read_csv(path, usecols=[*relationship_dtypes, "is_active"], dtype=relationship_dtypes)
+if DEBUG:
+    display(pdf_relationship_data)
 
 # METADATA ********************
 
@@ -158,11 +147,13 @@ with connect_semantic_model(dataset=semantic_model_name, readonly=False) as tom:
 
 # MARKDOWN ********************
 
-# The ***fabric.list_columns()*** function returns information about each column in the specified semantic model. We will use some of the information provided to determine how we will configure the column.
+# The ***fabric.list_columns()*** function returns information about each column in the specified semantic model. We will use some of the information provided to determine how we will configure the column. The full listing is displayed when ***DEBUG*** is set to True.
 
 # CELL ********************
 
-fabric.list_columns(dataset = semantic_model_name)
+all_cols = fabric.list_columns(dataset = semantic_model_name, workspace=workspace)
+if DEBUG:
+    display(all_cols)
 
 # METADATA ********************
 
@@ -173,13 +164,14 @@ fabric.list_columns(dataset = semantic_model_name)
 
 # MARKDOWN ********************
 
-# In the following cell, we are subsetting the data frame returned by ***fabric.list_columns()*** to only include the columns specified in the ***columns*** list variable. 
+# In the following cell, we are subsetting the data frame returned by ***fabric.list_columns()*** to only include the columns specified in the ***columns*** list variable. The subset is displayed when ***DEBUG*** is set to True.
 
 # CELL ********************
 
 columns = ["Table Name", "Column Name", "Hidden", "Is Available in MDX"]
-fdf_ColumnInfo = fabric.list_columns(dataset = semantic_model_name, workspace=workspace)[columns]
-display(fdf_ColumnInfo)
+fdf_ColumnInfo = all_cols[columns]
+if DEBUG:
+    display(fdf_ColumnInfo)
 
 
 # METADATA ********************
@@ -191,7 +183,11 @@ display(fdf_ColumnInfo)
 
 # CELL ********************
 
-fabric.refresh_tom_cache()
+FACT_TABLES = frozenset({'sales'})
+
+# Hide every fact-table column and every dimension key column
+mask = fdf_ColumnInfo['Table Name'].isin(FACT_TABLES) | fdf_ColumnInfo['Column Name'].str.endswith('_key')
+to_update = fdf_ColumnInfo.loc[mask, ['Table Name', 'Column Name']]
 
 # METADATA ********************
 
@@ -200,30 +196,20 @@ fabric.refresh_tom_cache()
 # META   "language_group": "synapse_pyspark"
 # META }
 
-# CELL ********************
-
-fact_tables = ['sales']
-
-with connect_semantic_model(dataset=semantic_model_name, workspace=workspace, readonly=False) as tom:
-    for index, row in fdf_ColumnInfo.iterrows():
-        if (row['Table Name'] in fact_tables) | ((row['Table Name'] not in fact_tables) & (row['Column Name'].endswith('_key'))):
-            tom.update_column(
-                 table_name=row['Table Name']
-                ,column_name=row['Column Name']
-                ,is_available_in_mdx=False
-                ,hidden=True
-            )
-
-# METADATA ********************
+# MARKDOWN ********************
 
-# META {
-# META   "language": "python",
-# META   "language_group": "synapse_pyspark"
-# META }
+# # Add Measures
 
 # CELL ********************
 
-fabric.refresh_tom_cache()
+fdfSalesColumnInfo = all_cols[all_cols["Table Name"].eq("sales") & all_cols["Column Name"].str.startswith("Fake")]
+if DEBUG:
+    display(fdfSalesColumnInfo)
+
+# Build each measure's name and DAX expression from its source column
+measure_columns = fdfSalesColumnInfo["Column Name"]
+measure_names = ("Total " + measure_columns.str.replace("_", " ", regex=False)).tolist()
+measure_expressions = ("=SUM(sales[" + measure_columns + "])").tolist()
 
 # METADATA ********************
 
@@ -232,39 +218,49 @@ fabric.refresh_tom_cache()
 # META   "language_group": "synapse_pyspark"
 # META }
 
-# CELL ********************
-
-fdf_ColumnInfo = fabric.list_columns(dataset = semantic_model_name, workspace=workspace)[columns]
-display(fdf_ColumnInfo)
-
-# METADATA ********************
+# MARKDOWN ********************
 
-# META {
-# META   "language": "python",
-# META   "language_group": "synapse_pyspark"
-# META }
+# # Apply the model changes
 
 # MARKDOWN ********************
 
-# # Add Measures
+# Opens the semantic model once and, in a single session, creates the relationships from ***pdf_relationship_data***, hides the columns in ***to_update*** and adds a measure for each column in ***fdfSalesColumnInfo***
 
 # CELL ********************
 
-fdfSalesColumnInfo = fabric.list_columns(dataset=semantic_model_name, table="sales")
-fdfSalesColumnInfo["Column Name"].str.startswith("Fake")
+with connect_semantic_model(dataset=semantic_model_name, workspace=workspace, readonly=False) as tom:
 
-# METADATA ********************
+    # Create the relationships
+    for row in pdf_relationship_data.itertuples(index=False):
+        tom.add_relationship(
+             from_table = row.from_table
+            ,from_column = row.from_column
+            ,from_cardinality = row.from_cardinality
+            ,to_table = row.to_table
+            ,to_column = row.to_column
+            ,to_cardinality = row.to_cardinality
+            ,is_active = bool(row.is_active == 1)
+        )
 
-# META {
-# META   "language": "python",
-# META   "language_group": "synapse_pyspark"
-# META }
+    # Hide the fact and key columns
+    for table_name, column_name in to_update.itertuples(index=False, name=None):
+        tom.update_column(
+             table_name=table_name
+            ,column_name=column_name
+            ,is_available_in_mdx=False
+            ,hidden=True
+        )
 
-# CELL ********************
+    # Add the measures
+    format_string = "#,##0"
+    for measure_name, expression in zip(measure_names, measure_expressions):
+        tom.add_measure(
+             table_name = "sales"
+            ,measure_name = measure_name
+            ,expression = expression
+            ,format_string = format_string
+        )
 
-fdfSalesColumnInfo = fabric.list_columns(dataset=semantic_model_name, table="sales")
-fdfSalesColumnInfo = fdfSalesColumnInfo[fdfSalesColumnInfo["Column Name"].str.startswith("Fake")]
-display(fdfSalesColumnInfo)
 
 # METADATA ********************
 
@@ -275,23 +271,7 @@ display(fdfSalesColumnInfo)
 
 # CELL ********************
 
-with connect_semantic_model(dataset=semantic_model_name, workspace=workspace, readonly=False) as tom:
-    for index, row in fdfSalesColumnInfo.iterrows():
-
-        # Define variables
-        table_name = row["Table Name"]
-        measure_name = f'Total {row["Column Name"].replace("_"," ")}'
-        expression = f'=SUM(sales[{row["Column Name"]}])'
-        format_string = "#,##0"
-
-        # Configure add_measure()
-        tom.add_measure(
-             table_name = table_name
-            ,measure_name = measure_name
-            ,expression = expression
-            ,format_string = format_string
-        )
-
+fabric.refresh_tom_cache()
 
 # METADATA ********************
 
@@ -302,7 +282,9 @@ with connect_semantic_model(dataset=semantic_model_name, workspace=workspace, re
 
 # CELL ********************
 
-fabric.refresh_tom_cache()
+if DEBUG:
+    fdf_ColumnInfo = fabric.list_columns(dataset = semantic_model_name, workspace=workspace)[columns]
+    display(fdf_ColumnInfo)
 
 # METADATA ********************
 
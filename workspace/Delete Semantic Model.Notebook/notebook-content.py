@@ -18,6 +18,9 @@
 
 import sempy_labs as labs
 import sempy.fabric as fabric
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # METADATA ********************
 
@@ -28,14 +31,33 @@ import sempy.fabric as fabric
 
 # CELL ********************
 
+MAX_WORKERS = 8
+MAX_RETRIES = 5
+
+def delete_dataset(dataset):
+    # Back off and retry when Fabric throttles the request (HTTP 429)
+    delay = 1.0
+    for attempt in range(MAX_RETRIES):
+        try:
+            return labs.delete_semantic_model(dataset=dataset, workspace=workspace)
+        except Exception as e:
+            status = getattr(e, "status_code", None) or getattr(getattr(e, "response", None), "status_code", None)
+            if attempt == MAX_RETRIES - 1 or status != 429:
+                raise
+            time.sleep(delay * random.uniform(0.8, 1.2))
+            delay *= 2
+
 workspace = fabric.get_workspace_id()
-datasets = fabric.list_datasets()['Dataset Name']
-for dataset in datasets:
-    try:
-        labs.delete_semantic_model(dataset=dataset, workspace=workspace)
-        print(f"Successfully deleted the {dataset} data set.")
-    except Exception as e:
-        print(f"Was not able to delete the {dataset} data set due to the following reasons: {e}")
+datasets = fabric.list_datasets(workspace=workspace)['Dataset Name']
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    futures = {executor.submit(delete_dataset, dataset): dataset for dataset in datasets}
+    for future in as_completed(futures):
+        dataset = futures[future]
+        try:
+            future.result()
+            print(f"Successfully deleted the {dataset} data set.")
+        except Exception as e:
+            print(f"Was not able to delete the {dataset} data set due to the following reasons: {e}")
 
 # METADATA ********************
 